@@ -1 +1,7 @@
 """Tasks for publishing my music."""
+
+import warnings
+
+# reapy warns on import when Reaper isn't running. Commands that need Reaper
+# report that more helpfully on first use, and other commands don't care.
+warnings.filterwarnings("ignore", message="Can't reach distant API")
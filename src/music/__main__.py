@@ -9,15 +9,31 @@ from pathlib import Path
 import click
 
 
-@click.group(name="music")
-def cli() -> None:
-    """Tasks for publishing my music."""
+class _LazyGroup(click.Group):
+    """Import each command's module only when it is needed.
+
+    Commands' dependencies, like reapy and openai, are slow to import. Running
+    one command shouldn't pay for all of them.
+    """
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(
+            command_file.parent.name
+            for command_file in Path(__file__).parent.glob("*/command.py")
+        )
 
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.list_commands(ctx):
+            return None
 
-for command_file in Path(__file__).parent.glob("*/command.py"):
-    command_package = command_file.parent.name
-    command_module = importlib.import_module(f"music.{command_package}.command")
-    cli.add_command(command_module.main)
+        command_module = importlib.import_module(f"music.{cmd_name}.command")
+        command: click.Command = command_module.main
+        return command
+
+
+@click.group(name="music", cls=_LazyGroup)
+def cli() -> None:
+    """Tasks for publishing my music."""
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -20,7 +20,13 @@ def main(example_audio_file: Path) -> None:
     fn_name = "parse_summary_stats"
 
     cmd = _cmd_for_stats(example_audio_file)
-    proc = subprocess.run(cmd, check=True, stderr=subprocess.PIPE, text=True)
+    proc = subprocess.run(
+        cmd,
+        check=True,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+    )
     proc_output = proc.stderr
 
     messages: list[openai.types.chat.ChatCompletionMessageParam] = [
@@ -12,4 +12,4 @@ def main() -> None:
     """Show the folder containing the current project."""
     project = music.util.ExtendedProject()
     cmd = ["open", project.path]
-    subprocess.run(cmd, check=True, stderr=subprocess.PIPE)
+    subprocess.run(cmd, check=True, stderr=subprocess.DEVNULL)
@@ -2,22 +2,16 @@
 
 import asyncio
 import dataclasses
-import email
-import warnings
-from collections.abc import Collection, Iterable
+from collections.abc import Iterable
 from pathlib import Path
 
 import aiohttp
 import click
+import reapy
 import rich.console
 import rich.live
 import rich.progress
 
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", message="Can't reach distant API")
-    import reapy
-
-
 import music.render.process
 import music.upload.process
 import music.util
@@ -177,7 +171,7 @@ async def main(
             param_hint="'SOUNDCLOUD_OAUTH_TOKEN'", param_type="envvar"
         )
 
-    parsed_additional_headers = {**email.message_from_string(additional_headers)}
+    parsed_additional_headers = music.util.parse_headers(additional_headers)
 
     projects = (
         (music.util.ExtendedProject.get_or_open(path) for path in project_dirs)
@@ -187,17 +181,18 @@ async def main(
 
     _validate_reaper()
 
-    versions = {
-        version
-        for version in (
-            include_main,
-            include_instrumental,
-            include_instrumental_dj,
-            include_acappella,
-            include_stems,
+    versions = (
+        SongVersion.union(
+            (
+                include_main,
+                include_instrumental,
+                include_instrumental_dj,
+                include_acappella,
+                include_stems,
+            )
         )
-        if version
-    } or (SongVersion.MAIN, SongVersion.INSTRUMENTAL, SongVersion.ACAPPELLA)
+        or music.util.DEFAULT_SONG_VERSIONS
+    )
 
     command = _Command(
         parsed_additional_headers,
@@ -210,6 +205,12 @@ async def main(
         versions,
     )
 
+    # Python 3.12+. Start tasks, like uploads, without a trip through the event
+    # loop, and skip scheduling them at all if they finish synchronously.
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
     renders, uploads = await command()
     _report(renders, uploads)
 
@@ -225,7 +226,7 @@ class _Command:
     upload_existing: bool
     vocal_loudness_worth: float | None
     projects: Iterable[music.util.ExtendedProject]
-    versions: Collection[SongVersion]
+    versions: SongVersion
 
     def __post_init__(
         self,
@@ -240,16 +241,23 @@ class _Command:
         progress_group = rich.console.Group(
             self.render_process.progress, self.upload_process.progress
         )
+        # There's no animation to show outside a terminal, only the final render
         with rich.live.Live(
-            progress_group, console=self.console, refresh_per_second=10
+            progress_group,
+            auto_refresh=self.console.is_terminal,
+            console=self.console,
+            refresh_per_second=4,
         ):
-            async with aiohttp.ClientSession() as client:
+            async with music.upload.process.client_session() as client:
                 renders = []
                 uploads = []
-                async for renders_, uploads_ in (
-                    await self._render_project(client, project)
-                    for project in self.projects
-                ):
+                # Opening a project blocks until Reaper loads it. Meanwhile, keep
+                # uploading the previous projects' renders.
+                projects = iter(self.projects)
+                while (
+                    project := await asyncio.to_thread(next, projects, None)
+                ) is not None:
+                    renders_, uploads_ = await self._render_project(client, project)
                     renders.extend(renders_)
                     uploads.extend(uploads_)
                 return renders, await asyncio.gather(*uploads, return_exceptions=True)
@@ -304,34 +312,24 @@ class _Command:
 
 
 def _existing_render_fils(
-    project: music.util.ExtendedProject, versions: Collection[SongVersion]
+    project: music.util.ExtendedProject, versions: SongVersion
 ) -> list[Path]:
     """Return a project's existing render files to upload.
 
     Eases uploading newer files when the render was performed separately.
     """
-    existing_versions = set(SongVersion).difference(versions)
-    return [
-        fil
-        for version in existing_versions
-        if (fil := version.path_for_project_dir(Path(project.path))) and fil.is_file()
-    ]
+    return music.util.find_render_fils(Path(project.path), ~versions)
 
 
 def _report(renders: list[RenderResult], uploads: list[None | BaseException]) -> None:
-    has_error = False
-
     upload_exceptions = [e for e in uploads if isinstance(e, BaseException)]
-    if upload_exceptions:
-        has_error = True
-        for e in upload_exceptions:
-            click.echo(e, err=True)
+    for e in upload_exceptions:
+        click.echo(e, err=True)
 
     if not renders:
-        has_error = True
         click.echo("Error: nothing to render", err=True)
 
-    if has_error:
+    if upload_exceptions or not renders:
         raise click.exceptions.Exit(2)
 
 
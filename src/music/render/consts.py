@@ -1,7 +1,8 @@
 """Reaper render constants."""
 
-# Experimentally determined dB scale for Reaper's built-in VST: ReaLimit
-LIMITER_RANGE = sum(abs(point) for point in (-60.0, 12.0))
+# Experimentally determined dB scale for Reaper's built-in VST: ReaLimit, from
+# -60.0 to 12.0
+LIMITER_RANGE = 72.0
 
 # RENDER_SETTINGS bit flags
 MONO_TRACKS_TO_MONO_FILES = 16
@@ -1,13 +1,15 @@
 """Context managers for before and after Reaper renders."""
 
 import contextlib
-import warnings
+import sys
 from collections.abc import Callable, Collection, Iterator
 from functools import partial
 from pathlib import Path
 from typing import TypeVar, cast
 
-from music.util import ExtendedProject, SongVersion, recurse_property, set_param_value
+import reapy
+
+from music.util import ExtendedProject, SongVersion, set_param_value
 
 from .consts import (
     LIMITER_RANGE,
@@ -16,13 +18,14 @@ from .consts import (
     SWS_ERROR_SENTINEL,
 )
 
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", message="Can't reach distant API")
-    import reapy
-
-
 T = TypeVar("T")
 
+# Indices of (master limiter FX, its threshold parameter), by project file. The
+# search is many Reaper API calls, and its result doesn't change between the
+# renders of a session. Not by project ID, which belongs to the Reaper tab,
+# and is reused when a run opens each project in turn.
+_MASTER_LIMITER_THRESHOLD_INDICES: dict[tuple[str, str], tuple[int, int]] = {}
+
 
 def adjust_master_limiter_threshold(
     project: reapy.core.Project, vocal_loudness_worth: float
@@ -31,25 +34,9 @@ def adjust_master_limiter_threshold(
     if vocal_loudness_worth == 0.0:
         return contextlib.nullcontext()
 
-    limiters = [fx for fx in project.master_track.fxs[::-1] if "Limit" in fx.name]
-    if not limiters:
-        raise ValueError("Master limiter not found")
-    limiter = limiters[0]
-
-    def safe_param_name(param: reapy.core.FXParam) -> str:
-        """Work around uncaught exception for non-UTF-8 strings in parameter names."""
-        try:
-            return param.name
-        except reapy.errors.DistError as ex:
-            if "UnicodeDecodeError" in str(ex):
-                return ""
-            raise
-
-    thresholds = [
-        param for param in limiter.params if "Threshold" in safe_param_name(param)
-    ]
-    threshold = thresholds[0]
-    threshold_previous_value = threshold.normalized
+    with reapy.inside_reaper():
+        threshold = _find_master_limiter_threshold(project)
+        threshold_previous_value = threshold.normalized
     threshold_louder_value = (
         (threshold_previous_value * LIMITER_RANGE) - vocal_loudness_worth
     ) / LIMITER_RANGE
@@ -104,21 +91,12 @@ def adjust_render_settings(
 
     custom_time_bounds = 0
     with reapy.inside_reaper():
-        startpos = min(
-            (
-                item.position
-                for track in project.tracks
-                if not _is_muted(track)
-                for item in track.items
-            ),
-            default=0.0,
-        )
+        items = [item for track in _unmuted_tracks(project) for item in track.items]
+        startpos = min((item.position for item in items), default=0.0)
         endpos = max(
             (
                 item.position + item.length
-                for track in project.tracks
-                if not _is_muted(track)
-                for item in track.items
+                for item in items
                 if not item.get_info_value("B_MUTE_ACTUAL")
             ),
             default=0.0,
@@ -179,6 +157,34 @@ def avoid_fx_tails(project: ExtendedProject) -> Iterator[None]:
         yield
 
 
+@contextlib.contextmanager
+def batch_enter_exit(
+    *ctxs: contextlib.AbstractContextManager[None],
+) -> Iterator[None]:
+    """Enter all the given context managers in one batch of Reaper API calls, then exit them all in another batch.
+
+    Unlike wrapping the whole block in `reapy.inside_reaper()`, Reaper is not
+    held for the duration of the block, for example while it is rendering. As
+    with nested `with` statements, an exception raised in the block is passed
+    to each context manager's exit.
+    """
+    with contextlib.ExitStack() as stack:
+        with reapy.inside_reaper():
+            for ctx in ctxs:
+                stack.enter_context(ctx)
+        exits = stack.pop_all()
+
+    try:
+        yield
+    except BaseException:
+        with reapy.inside_reaper():
+            if not exits.__exit__(*sys.exc_info()):
+                raise
+    else:
+        with reapy.inside_reaper():
+            exits.close()
+
+
 @contextlib.contextmanager
 def get_set_restore(
     getter: Callable[[], T], setter: Callable[[T], None], during_value: T
@@ -207,21 +213,92 @@ def toggle_fx_for_tracks(
     tracks: Collection[reapy.core.Track], is_enabled: bool
 ) -> Iterator[None]:
     """Toggle all effects in the given collection of tracks, then toggle them back."""
-    fxs = [
-        fx
-        for track in tracks
-        for i in range(len(track.fxs))
-        if (fx := track.fxs[i]) and fx.is_enabled != is_enabled
-    ]
-    for fx in fxs:
-        fx.is_enabled = is_enabled
+    with reapy.inside_reaper():
+        fxs = [
+            fx for track in tracks for fx in track.fxs[:] if fx.is_enabled != is_enabled
+        ]
+        for fx in fxs:
+            fx.is_enabled = is_enabled
     yield
-    for fx in fxs:
-        fx.is_enabled = not is_enabled
+    with reapy.inside_reaper():
+        for fx in fxs:
+            fx.is_enabled = not is_enabled
+
 
+def _find_master_limiter_threshold(project: reapy.core.Project) -> reapy.core.FXParam:
+    """Find the `project` master track's master limiter's threshold parameter, by name, caching its location.
 
-def _is_muted(track: reapy.core.Track) -> bool:
-    return track.is_muted or any(
-        parent_track.is_muted
-        for parent_track in recurse_property("parent_track", track)
+    Searches again if the FX chain changed since the location was cached.
+    """
+    fxs = project.master_track.fxs
+    project_file = (project.path, project.name)
+
+    if (cached := _MASTER_LIMITER_THRESHOLD_INDICES.get(project_file)) is not None:
+        cached_limiter_index, cached_threshold_index = cached
+        if (
+            cached_limiter_index < len(fxs)
+            and "Limit" in (cached_limiter := fxs[cached_limiter_index]).name
+        ):
+            params = cached_limiter.params
+            threshold = (
+                params[cached_threshold_index]
+                if cached_threshold_index < len(params)
+                else None
+            )
+            if threshold is not None and "Threshold" in _safe_param_name(threshold):
+                return threshold
+
+    # The limiter is typically the last FX, so search from the end
+    limiter_index = next(
+        (i for i in reversed(range(len(fxs))) if "Limit" in fxs[i].name), None
+    )
+    if limiter_index is None:
+        raise ValueError("Master limiter not found")
+    limiter = fxs[limiter_index]
+
+    # Stop fetching parameter names from Reaper at the first match
+    threshold_index = next(
+        (
+            i
+            for i, param in enumerate(limiter.params)
+            if "Threshold" in _safe_param_name(param)
+        ),
+        None,
     )
+    if threshold_index is None:
+        raise ValueError("Master limiter threshold not found")
+
+    _MASTER_LIMITER_THRESHOLD_INDICES[project_file] = (limiter_index, threshold_index)
+    return limiter.params[threshold_index]
+
+
+def _safe_param_name(param: reapy.core.FXParam) -> str:
+    """Work around uncaught exception for non-UTF-8 strings in parameter names."""
+    try:
+        return param.name
+    except reapy.errors.DistError as ex:
+        if "UnicodeDecodeError" in str(ex):
+            return ""
+        raise
+
+
+def _unmuted_tracks(project: reapy.core.Project) -> list[reapy.core.Track]:
+    """Find the `project` tracks that are neither muted nor in a muted folder.
+
+    Reaper lists parent tracks before their children, so whether each track is
+    in a muted folder is known from its parent, in one pass over the tracks.
+    """
+    is_muted_by_id: dict[str, bool] = {}
+    unmuted_tracks = []
+
+    for track in project.tracks:
+        parent = track.parent_track
+        is_muted = track.is_muted or (
+            parent is not None and is_muted_by_id.get(parent.id, False)
+        )
+        is_muted_by_id[track.id] = is_muted
+
+        if not is_muted:
+            unmuted_tracks.append(track)
+
+    return unmuted_tracks
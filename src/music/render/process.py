@@ -1,20 +1,21 @@
 """Render processing class and functions to handle the possible versions of a song."""
 
+import array
+import asyncio
 import datetime
-import random
-import shutil
+import itertools
+import os
 import subprocess
-import warnings
+import sys
+import wave
 from collections.abc import AsyncIterator, Awaitable, Callable
-from functools import cached_property
+from functools import cached_property, partial
+from operator import attrgetter
 from pathlib import Path
 from timeit import default_timer as timer
 from typing import Literal
 
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", message="Can't reach distant API")
-    import reapy
-
+import reapy
 import rich.box
 import rich.console
 import rich.progress
@@ -32,12 +33,25 @@ from .contextmanagers import (
     adjust_render_pattern,
     adjust_render_settings,
     avoid_fx_tails,
+    batch_enter_exit,
     mute_tracks,
     toggle_fx_for_tracks,
 )
 from .result import ExistingRenderResult, RenderResult
 from .tracks import find_acappella_tracks_to_mute, find_stems, find_vox_tracks_to_mute
 
+_TRIM_EDGE_DURATION_S = 0.2
+_TRIM_LEADING_SILENCE_DURATION_S = 1.0
+_TRIM_SILENCE_THRESHOLD = 0.02
+_TRIM_TRAILING_SILENCE_DURATION_S = 3.0
+
+_TMP_COUNTER = itertools.count()
+
+
+def _tmp_id() -> str:
+    """Generate an ID for a temporary file, unique across processes and calls."""
+    return f"{os.getpid()}-{next(_TMP_COUNTER)}"
+
 
 async def render_version(
     project: ExtendedProject, version: SongVersion, *, dry_run: bool
@@ -50,13 +64,13 @@ async def render_version(
     Adjusts some global and project preferences, then restores the original
     values after render completion.
     """
-    out_name = version.name_for_project_dir(Path(project.path))
+    project_dir = Path(project.path)
+    out_name = version.name_for_project_dir(project_dir)
 
     # Avoid "Overwrite" "Render Warning" dialog, which can't be scripted, with a temporary filename
-    rand_id = random.randrange(10**5, 10**6)
-    in_name = f"{out_name} {rand_id}.tmp"
+    in_name = f"{out_name} {_tmp_id()}.tmp"
 
-    with (
+    with batch_enter_exit(
         avoid_fx_tails(project),
         adjust_render_settings(project, version),
         adjust_render_pattern(project, Path(in_name).joinpath(*version.pattern)),
@@ -65,7 +79,7 @@ async def render_version(
         await project.render()
         time_end = timer()
 
-    out_fil = version.path_for_project_dir(Path(project.path))
+    out_fil = version.path_for_project_dir(project_dir)
     if version == SongVersion.STEMS:
         tmp_fil = out_fil.parent / in_name
     else:
@@ -80,11 +94,13 @@ async def render_version(
         eager=dry_run,
     )
 
+    # Deleting a stems directory tree takes a moment. Don't block in-flight
+    # uploads meanwhile.
     if dry_run:
-        rm_rf(tmp_fil)
+        await asyncio.to_thread(rm_rf, tmp_fil)
     else:
-        rm_rf(final_fil)
-        shutil.move(tmp_fil, final_fil)
+        await asyncio.to_thread(rm_rf, final_fil)
+        os.replace(tmp_fil, final_fil)
 
     return result
 
@@ -92,14 +108,30 @@ async def render_version(
 def trim_silence(fil: Path) -> None:
     """Trim leading and trailing silence from the given audio file, in-place.
 
-    H/T https://superuser.com/a/1715017
+    Trims PCM WAV files, like Reaper's renders, by copying only the kept
+    frames, without decoding and re-encoding the audio. Falls back to ffmpeg
+    for other formats.
     """
-    leading_silence_duration_s = 1.0
-    trailing_silence_duration_s = 3.0
+    # Next to the file, on the same filesystem, so replacing it is a rename
+    tmp_fil = Path(f"{fil} {_tmp_id()}.tmp.wav")
+
+    try:
+        _trim_silence_wav(fil, tmp_fil)
+    except (EOFError, wave.Error):
+        rm_rf(tmp_fil)
+        _trim_silence_ffmpeg(fil, tmp_fil)
+
+    os.replace(tmp_fil, fil)
 
-    rand_id = random.randrange(10**5, 10**6)
-    tmp_fil = f"{fil} {rand_id}.tmp.wav"
 
+def _trim_silence_ffmpeg(fil: Path, tmp_fil: Path) -> None:
+    """Trim leading and trailing silence from the given audio file into `tmp_fil`, with ffmpeg.
+
+    H/T https://superuser.com/a/1715017
+
+    Peak detection is cheaper than the default RMS, and the edges of a render
+    are digital silence.
+    """
     cmd: list[str | Path] = [
         "ffmpeg",
         "-i",
@@ -108,26 +140,102 @@ def trim_silence(fil: Path) -> None:
         ",".join(
             (
                 "areverse",
-                "atrim=start=0.2",
-                f"silenceremove=start_periods=1:start_silence={trailing_silence_duration_s}:start_threshold=0.02",
+                f"atrim=start={_TRIM_EDGE_DURATION_S}",
+                f"silenceremove=start_periods=1:start_silence={_TRIM_TRAILING_SILENCE_DURATION_S}:start_threshold={_TRIM_SILENCE_THRESHOLD}:detection=peak",
                 "areverse",
-                "atrim=start=0.2",
-                f"silenceremove=start_periods=1:start_silence={leading_silence_duration_s}:start_threshold=0.02",
+                f"atrim=start={_TRIM_EDGE_DURATION_S}",
+                f"silenceremove=start_periods=1:start_silence={_TRIM_LEADING_SILENCE_DURATION_S}:start_threshold={_TRIM_SILENCE_THRESHOLD}:detection=peak",
             )
         ),
         tmp_fil,
     ]
     subprocess.run(cmd, check=True, stderr=subprocess.PIPE, text=True)
 
-    shutil.move(tmp_fil, fil)
+
+def _trim_silence_wav(fil: Path, tmp_fil: Path) -> None:
+    """Trim leading and trailing silence from the given PCM WAV file into `tmp_fil`.
+
+    Matches the ffmpeg filters, with peak detection. Only the silent edges of
+    the audio are decoded, one second at a time.
+
+    Raises `wave.Error` for unsupported formats.
+    """
+    with wave.open(str(fil), "rb") as src:
+        params = src.getparams()
+        if params.sampwidth not in (2, 3, 4):
+            raise wave.Error(f"unsupported sample width: {params.sampwidth}")
+
+        edge = round(_TRIM_EDGE_DURATION_S * params.framerate)
+        bounds = (edge, params.nframes - edge)
+        start = stop = edge
+        if (first := _find_loud_frame(src, *bounds)) is not None:
+            last = _find_loud_frame(src, first, bounds[1], reverse=True)
+            assert last is not None
+            start = max(
+                bounds[0],
+                first - round(_TRIM_LEADING_SILENCE_DURATION_S * params.framerate),
+            )
+            stop = min(
+                bounds[1],
+                last + 1 + round(_TRIM_TRAILING_SILENCE_DURATION_S * params.framerate),
+            )
+
+        with wave.open(str(tmp_fil), "wb") as dst:
+            dst.setparams(params)
+            src.setpos(start)
+            for pos in range(start, stop, params.framerate):
+                dst.writeframesraw(src.readframes(min(params.framerate, stop - pos)))
+
+
+def _find_loud_frame(
+    src: wave.Wave_read, start: int, stop: int, *, reverse: bool = False
+) -> int | None:
+    """Find the first frame, or the last frame if `reverse`, between `start` and `stop` with a sample louder than the silence threshold."""
+    block_size = src.getframerate()
+    nchannels = src.getnchannels()
+    sampwidth = src.getsampwidth()
+    threshold = _TRIM_SILENCE_THRESHOLD * 2**31
+
+    blocks = range(start, stop, block_size)
+    for block_start in reversed(blocks) if reverse else blocks:
+        src.setpos(block_start)
+        frames = src.readframes(min(block_size, stop - block_start))
+
+        # Widen the little-endian samples to 32 bits, to decode them in bulk
+        widened = bytearray(len(frames) // sampwidth * 4)
+        for i in range(sampwidth):
+            widened[4 - sampwidth + i :: 4] = frames[i::sampwidth]
+        samples = array.array("i", widened)
+        if sys.byteorder == "big":
+            samples.byteswap()
+
+        if not _is_loud(samples, threshold):
+            continue
+
+        # Narrow down to the loud sample by halves, keeping the scans in bulk
+        lo, hi = 0, len(samples)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            halves = ((lo, mid), (mid, hi))
+            near, far = reversed(halves) if reverse else halves
+            lo, hi = near if _is_loud(samples[slice(*near)], threshold) else far
+
+        return block_start + lo // nchannels
+
+    return None
+
+
+def _is_loud(samples: "array.array[int]", threshold: float) -> bool:
+    return max(samples, default=0) > threshold or min(samples, default=0) < -threshold
 
 
 async def _render_main(
     project: ExtendedProject, *vocals: reapy.core.Track, dry_run: bool, verbose: int
 ) -> RenderResult:
-    for vocal in vocals:
-        vocal.unsolo()
-        vocal.unmute()
+    with reapy.inside_reaper():
+        for vocal in vocals:
+            vocal.unsolo()
+            vocal.unmute()
     return await render_version(project, SongVersion.MAIN, dry_run=dry_run)
 
 
@@ -139,7 +247,7 @@ async def _render_version_with_muted_tracks(
     vocal_loudness_worth: float,
     verbose: int,
 ) -> RenderResult:
-    with (
+    with batch_enter_exit(
         adjust_master_limiter_threshold(project, vocal_loudness_worth),
         mute_tracks(tracks_to_mute),
     ):
@@ -155,14 +263,11 @@ async def _render_a_cappella(
 ) -> RenderResult:
     tracks_to_mute = find_acappella_tracks_to_mute(project)
 
-    with (
+    with batch_enter_exit(
         adjust_master_limiter_threshold(project, vocal_loudness_worth),
         mute_tracks(tracks_to_mute),
     ):
-        out = await render_version(project, SongVersion.ACAPPELLA, dry_run=dry_run)
-
-    trim_silence(out.fil)
-    return out
+        return await render_version(project, SongVersion.ACAPPELLA, dry_run=dry_run)
 
 
 async def _render_stems(
@@ -171,17 +276,24 @@ async def _render_stems(
     dry_run: bool,
     verbose: int,
 ) -> RenderResult:
-    for vocal in vocals:
-        vocal.unsolo()
-        vocal.unmute()
-    for track in project.tracks:
-        track.unselect()
-    for track in find_stems(project):
-        track.select()
+    with reapy.inside_reaper():
+        for vocal in vocals:
+            vocal.unsolo()
+            vocal.unmute()
+        stem_ids = {track.id for track in find_stems(project)}
+        for track in project.tracks:
+            if track.id in stem_ids:
+                track.select()
+            else:
+                track.unselect()
     with toggle_fx_for_tracks([project.master_track], is_enabled=False):
         return await render_version(project, SongVersion.STEMS, dry_run=dry_run)
 
 
+# A version, its progress bar task, and its post-processing and analysis
+_Analysis = tuple[SongVersion, rich.progress.TaskID, asyncio.Task[RenderResult]]
+
+
 class Process:
     """Encapsulate the state of rendering a Reaper project."""
 
@@ -203,60 +315,67 @@ class Process:
         no output. For example, if a project does not have vocals, rendering an a
         capella or instrumental version are skipped.
         """
-        vocals = [track for track in project.tracks if track.name == "Vocals"]
+        # Each read of the project's path is a call into Reaper
+        project_dir = Path(project.path)
+        with reapy.inside_reaper():
+            vocals = [track for track in project.tracks if track.name == "Vocals"]
+            vox = (
+                find_vox_tracks_to_mute(project)
+                if SongVersion.INSTRUMENTAL in versions
+                or SongVersion.INSTRUMENTAL_DJ in versions
+                else []
+            )
 
         if vocal_loudness_worth is None:
             vocal_loudness_worth = float(
                 project.metadata.get("vocal-loudness-worth", VOCAL_LOUDNESS_WORTH)
             )
 
-        results = []
+        results: list[
+            tuple[
+                SongVersion,
+                Callable[[], Awaitable[RenderResult]],
+                rich.progress.TaskID,
+            ]
+        ] = []
 
         if SongVersion.MAIN in versions:
             results.append(
                 (
                     SongVersion.MAIN,
-                    lambda: _render_main(
-                        project, *vocals, dry_run=dry_run, verbose=verbose
+                    partial(
+                        _render_main, project, *vocals, dry_run=dry_run, verbose=verbose
                     ),
-                    self._add_task(project, SongVersion.MAIN),
+                    self._add_task(project_dir, SongVersion.MAIN),
                 )
             )
 
-        if SongVersion.INSTRUMENTAL in versions and (
-            vocals or find_vox_tracks_to_mute(project)
-        ):
+        if SongVersion.INSTRUMENTAL in versions and (vocals or vox):
             results.append(
                 (
                     SongVersion.INSTRUMENTAL,
-                    lambda: _render_version_with_muted_tracks(
+                    partial(
+                        _render_version_with_muted_tracks,
                         SongVersion.INSTRUMENTAL,
                         project,
-                        *[
-                            track
-                            for track in [*vocals, *find_vox_tracks_to_mute(project)]
-                            if track
-                        ],
+                        *[track for track in [*vocals, *vox] if track],
                         dry_run=dry_run,
                         vocal_loudness_worth=vocal_loudness_worth,
                         verbose=verbose,
                     ),
-                    self._add_task(project, SongVersion.INSTRUMENTAL),
+                    self._add_task(project_dir, SongVersion.INSTRUMENTAL),
                 )
             )
 
         # SongVersion.INSTRUMENTAL_DJ only mutes the main vocal. However, if
         # there are no other vox tracks, the version is identical to
         # SongVersion.INSTRUMENTAL, and is skipped.
-        if (
-            SongVersion.INSTRUMENTAL_DJ in versions
-            and vocals
-            and find_vox_tracks_to_mute(project)
-        ):
+        if SongVersion.INSTRUMENTAL_DJ in versions and vocals and vox:
             results.append(
                 (
                     SongVersion.INSTRUMENTAL_DJ,
-                    lambda: _render_version_with_muted_tracks(
+                    partial(
+                        _render_version_with_muted_tracks,
                         SongVersion.INSTRUMENTAL_DJ,
                         project,
                         *vocals,
@@ -264,7 +383,7 @@ class Process:
                         vocal_loudness_worth=vocal_loudness_worth,
                         verbose=verbose,
                     ),
-                    self._add_task(project, SongVersion.INSTRUMENTAL_DJ),
+                    self._add_task(project_dir, SongVersion.INSTRUMENTAL_DJ),
                 )
             )
 
@@ -272,13 +391,14 @@ class Process:
             results.append(
                 (
                     SongVersion.ACAPPELLA,
-                    lambda: _render_a_cappella(
+                    partial(
+                        _render_a_cappella,
                         project,
                         dry_run=dry_run,
                         vocal_loudness_worth=vocal_loudness_worth,
                         verbose=verbose,
                     ),
-                    self._add_task(project, SongVersion.ACAPPELLA),
+                    self._add_task(project_dir, SongVersion.ACAPPELLA),
                 )
             )
 
@@ -286,31 +406,26 @@ class Process:
             results.append(
                 (
                     SongVersion.STEMS,
-                    lambda: _render_stems(
-                        project, *vocals, dry_run=dry_run, verbose=verbose
+                    partial(
+                        _render_stems,
+                        project,
+                        *vocals,
+                        dry_run=dry_run,
+                        verbose=verbose,
                     ),
-                    self._add_task(project, SongVersion.STEMS),
+                    self._add_task(project_dir, SongVersion.STEMS),
                 )
             )
 
-        for i, (version, render, task) in enumerate(results):
-            if i > 0:
-                self.console.print()
-
-            self.progress.start_task(task)
-
-            yield (
-                version,
-                await self._print_stats_for_render(
-                    ExistingRenderResult(project, version), render, verbose=verbose
-                ),
-            )
-
-            self.progress.update(task, advance=1)
+        async for result in self._render_and_analyze(
+            project, results, dry_run=dry_run, verbose=verbose
+        ):
+            yield result
 
         if len(results):
             # Render causes a project to have unsaved changes, no matter what. Save the user a step.
-            project.save()
+            # Saving a large project takes a moment. Don't block in-flight uploads meanwhile.
+            await asyncio.to_thread(project.save)
 
     @cached_property
     def progress(self) -> rich.progress.Progress:
@@ -322,30 +437,154 @@ class Process:
         )
 
     def _add_task(
-        self, project: ExtendedProject, version: SongVersion
+        self, project_dir: Path, version: SongVersion
     ) -> rich.progress.TaskID:
         return self.progress.add_task(
-            f'Rendering "{version.name_for_project_dir(Path(project.path))}"',
+            f'Rendering "{version.name_for_project_dir(project_dir)}"',
             start=False,
             total=1,
         )
 
+    async def _render_and_analyze(
+        self,
+        project: ExtendedProject,
+        results: list[
+            tuple[
+                SongVersion,
+                Callable[[], Awaitable[RenderResult]],
+                rich.progress.TaskID,
+            ]
+        ],
+        *,
+        dry_run: bool,
+        verbose: int,
+    ) -> AsyncIterator[tuple[SongVersion, RenderResult]]:
+        """Pipeline the given renders and their analyses.
+
+        Reaper renders one version at a time. Meanwhile, previous versions'
+        renders are post-processed and analyzed in ffmpeg. Yields each version,
+        in order, as soon as its own analysis finishes, even while the next
+        version renders.
+
+        If a render fails, still yields the versions already rendered, before
+        raising. If an analysis fails, renders no further versions, but lets the
+        version already rendering finish, before raising. Only cancellation
+        interrupts a render.
+        """
+        analyses: asyncio.Queue[_Analysis | None] = asyncio.Queue()
+        stop = asyncio.Event()
+        renders = asyncio.create_task(
+            self._render_all(
+                project, results, analyses, stop, dry_run=dry_run, verbose=verbose
+            )
+        )
+
+        try:
+            while (analysis := await analyses.get()) is not None:
+                yield await self._finish_analysis(*analysis)
+            await renders
+        except asyncio.CancelledError:
+            renders.cancel()
+            raise
+        finally:
+            stop.set()
+            await asyncio.gather(renders, return_exceptions=True)
+
+            pending = []
+            while not analyses.empty():
+                if (analysis := analyses.get_nowait()) is not None:
+                    analysis[2].cancel()
+                    pending.append(analysis[2])
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _render_all(
+        self,
+        project: ExtendedProject,
+        results: list[
+            tuple[
+                SongVersion,
+                Callable[[], Awaitable[RenderResult]],
+                rich.progress.TaskID,
+            ]
+        ],
+        analyses: asyncio.Queue[_Analysis | None],
+        stop: asyncio.Event,
+        *,
+        dry_run: bool,
+        verbose: int,
+    ) -> None:
+        """Render the given versions one at a time, queueing each one's analysis as its render completes.
+
+        Stops before the next render once `stop` is set. Queues `None` when
+        done, whether or not the renders succeeded.
+        """
+        previous: asyncio.Task[RenderResult] | None = None
+
+        try:
+            for version, render, task in results:
+                if stop.is_set():
+                    break
+
+                self.progress.start_task(task)
+
+                before_stats = await asyncio.to_thread(
+                    attrgetter("summary_stats"), ExistingRenderResult(project, version)
+                )
+                out = await render()
+
+                previous = asyncio.create_task(
+                    self._print_stats_for_render(
+                        before_stats,
+                        out,
+                        dry_run=dry_run,
+                        previous=previous,
+                        verbose=verbose,
+                    )
+                )
+                analyses.put_nowait((version, task, previous))
+        finally:
+            analyses.put_nowait(None)
+
+    async def _finish_analysis(
+        self,
+        version: SongVersion,
+        task: rich.progress.TaskID,
+        analysis: asyncio.Task[RenderResult],
+    ) -> tuple[SongVersion, RenderResult]:
+        out = await analysis
+        self.progress.update(task, advance=1)
+        return version, out
+
     async def _print_stats_for_render(
         self,
-        existing_render: ExistingRenderResult,
-        render: Callable[[], Awaitable[RenderResult]],
+        before_stats: dict[str, float | str],
+        out: RenderResult,
         *,
+        dry_run: bool,
+        previous: asyncio.Task[RenderResult] | None,
         verbose: int,
     ) -> RenderResult:
-        """Collect and print before and after summary statistics for the given project version render.
+        """Post-process the given project version render, then print its before and after summary statistics.
 
-        Returns the rendered file, after pretty printing itsprogress and metadata.
-        """
-        before_stats = existing_render.summary_stats
-        out = await render()
-        after_stats = out.summary_stats
+        Returns the rendered file, after pretty printing its progress and metadata.
 
-        self.console.print(f"[b default]{out.name}[/b default]")
+        Runs the blocking ffmpeg and ffprobe subprocesses in threads, to not
+        block the event loop, e.g. the render of the next version or uploads of
+        previous renders.
+        """
+        # A dry run's render file is already deleted
+        if out.version == SongVersion.ACAPPELLA and not dry_run:
+            await asyncio.to_thread(trim_silence, out.fil)
+
+        after_stats = await asyncio.to_thread(lambda: out.summary_stats)
+        await asyncio.to_thread(lambda: out.duration_delta)
+
+        # Print after the previous render's table, separated from it in the
+        # same write. Its errors are raised where it is awaited, not here.
+        if previous is not None:
+            await asyncio.wait([previous])
+        separator = "" if previous is None else "\n"
+        self.console.print(f"{separator}[b default]{out.name}[/b default]")
         self.console.print(f"[default dim italic]{out.fil}[/default dim italic]")
 
         table = rich.table.Table(
@@ -1,10 +1,10 @@
 """Helpers for managing and querying render ouput."""
 
 import datetime
+import json
 import math
-import re
 import subprocess
-from functools import cached_property
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 from music.__codegen__ import stats
@@ -20,13 +20,14 @@ class ExistingRenderResult:
     def __init__(self, project: ExtendedProject, version: SongVersion):
         """Initialize."""
         self.project = project
+        self.project_dir = Path(project.path)
         self.version = version
-        self.fil = version.path_for_project_dir(Path(project.path))
+        self.fil = version.path_for_project_dir(self.project_dir)
 
     @property
     def name(self) -> str:
         """Name of the project."""
-        return self.version.name_for_project_dir(Path(self.project.path))
+        return self.version.name_for_project_dir(self.project_dir)
 
     @cached_property
     def summary_stats(self) -> dict[str, float | str]:
@@ -52,7 +53,7 @@ class RenderResult(ExistingRenderResult):
         """Override. Initialize."""
         super().__init__(project, version)
         self.fil = fil
-        self.render_delta = datetime.timedelta(seconds=round(render_delta.seconds))
+        self._render_seconds = round(render_delta.total_seconds())
 
         if eager:
             # Trigger computation eagerly. For example, the input file might be
@@ -64,41 +65,123 @@ class RenderResult(ExistingRenderResult):
     def duration_delta(self) -> datetime.timedelta:
         """How long the audio file is.
 
+        Reuses the duration ffmpeg already reported while collecting the file's
+        summary statistics, rather than probing the file a second time.
+
         If the file a directory, sums the length of all audio files in the
         directory, recursively.
         """
+        if self.fil.is_dir():
+            seconds = sum(_probe_duration(fil) for fil in self.fil.glob("**/*.wav"))
+        elif isinstance(duration := self.summary_stats.get("duration"), str):
+            seconds = _parse_duration(duration)
+        else:
+            seconds = _probe_duration(self.fil)
+
+        return datetime.timedelta(seconds=round(seconds))
 
-        def delta_for_audio(fil: Path) -> float:
-            proc = subprocess.run(
-                ["ffprobe", "-i", fil, "-show_entries", "format=duration"],
-                capture_output=True,
-                check=True,
-                text=True,
-            )
-            proc_output = proc.stdout
-            delta_str = re.search(r"duration=(\S+)", proc_output).group(1)  # type: ignore[union-attr]
-            return 0.0 if delta_str == "N/A" else float(delta_str)
-
-        fils = self.fil.glob("**/*.wav") if self.fil.is_dir() else [self.fil]
-        deltas = [delta_for_audio(fil) for fil in fils]
-        return datetime.timedelta(seconds=round(sum(deltas)))
+    @cached_property
+    def render_delta(self) -> datetime.timedelta:
+        """How long the render took."""
+        return datetime.timedelta(seconds=self._render_seconds)
 
     @property
     def render_speedup(self) -> float:
         """How much faster the render was than the audio file's duration."""
         return (
-            (self.duration_delta / self.render_delta) if self.render_delta else math.inf
+            (self.duration_delta.total_seconds() / self._render_seconds)
+            if self._render_seconds
+            else math.inf
         )
 
 
 def summary_stats_for_file(fil: Path, *, verbose: int = 0) -> dict[str, float | str]:
-    """Print statistics for the given audio file, like LUFS-I and LRA."""
+    """Print statistics for the given audio file, like LUFS-I and LRA.
+
+    Caches the result until the file changes. A render replaces the file with
+    a new one, which may have the same size and, within the filesystem's
+    timestamp granularity, the same modification time, but not the same inode.
+    """
+    stat = fil.stat()
+    return dict(
+        _summary_stats_for_file_cached(fil, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    )
+
+
+@lru_cache(maxsize=128)
+def _summary_stats_for_file_cached(
+    fil: Path, file_ino: int, file_size: int, file_mtime_ns: int
+) -> dict[str, float | str]:
+    """Print statistics for the given audio file, like LUFS-I and LRA.
+
+    The file's inode, size, and modification time are unused, except as cache
+    keys.
+    """
     cmd = _cmd_for_stats(fil)
-    proc = subprocess.run(cmd, check=True, stderr=subprocess.PIPE, text=True)
+    proc = subprocess.run(
+        cmd,
+        check=True,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+    )
     proc_output = proc.stderr
     return stats.parse_summary_stats(proc_output)
 
 
+def _parse_duration(timestamp: str) -> float:
+    """Parse ffmpeg's HH:MM:SS.ss duration format into seconds."""
+    hours, minutes, seconds = timestamp.split(":")
+    return int(hours) * 60 * 60 + int(minutes) * 60 + float(seconds)
+
+
+def _probe_duration(fil: Path) -> float:
+    """Probe the given audio file for its duration, in seconds.
+
+    Caches the result until the file changes.
+    """
+    stat = fil.stat()
+    return _probe_duration_cached(fil, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=128)
+def _probe_duration_cached(
+    fil: Path, file_ino: int, file_size: int, file_mtime_ns: int
+) -> float:
+    """Probe the given audio file for its duration, in seconds.
+
+    The file's inode, size, and modification time are unused, except as cache
+    keys.
+
+    Falls back to the audio stream's duration if the container's is not
+    available.
+    """
+    proc = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "quiet",
+            "-i",
+            fil,
+            "-show_entries",
+            "format=duration:stream=duration",
+            "-of",
+            "json",
+        ],
+        check=True,
+        stderr=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    probe = json.loads(proc.stdout)
+    for entries in (probe.get("format", {}), *probe.get("streams", [])):
+        duration = entries.get("duration", "N/A")
+        if duration != "N/A":
+            return float(duration)
+
+    return 0.0
+
+
 def _cmd_for_stats(fil: Path) -> list[str | Path]:
     return [
         "ffmpeg",
@@ -110,5 +193,5 @@ def _cmd_for_stats(fil: Path) -> list[str | Path]:
         "-nostats",
         "-f",
         "null",
-        "/dev/null",
+        "-",
     ]
@@ -1,12 +1,6 @@
 """Helpers for Reaper tracks."""
 
-import warnings
-
-from music.util import recurse_property
-
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", message="Can't reach distant API")
-    import reapy
+import reapy
 
 
 def find_acappella_tracks_to_mute(
@@ -18,18 +12,26 @@ def find_acappella_tracks_to_mute(
     multiple tracks by hand. Skip tracks that are already muted (wouldn't want
     to ultimately unmute them). Skip tracks that contain no media items
     themselves and still might contribute to the vocal, e.g. sends with FX.
+
+    Reaper lists parent tracks before their children, so whether each track is
+    under the vocal folder is known from its parent, in one pass over the
+    tracks, reading each track's properties once.
     """
+    is_vocal_by_id: dict[str, bool] = {}
+    tracks_to_mute = []
+
+    with reapy.inside_reaper():
+        for track in project.tracks:
+            parent = track.parent_track
+            is_vocal = track.name == "Vocals" or (
+                parent is not None and is_vocal_by_id.get(parent.id, False)
+            )
+            is_vocal_by_id[track.id] = is_vocal
 
-    def is_vocal(track: reapy.Track) -> bool:
-        return any(
-            track.name == "Vocals" for track in recurse_property("parent_track", track)
-        )
+            if not is_vocal and not track.is_muted and bool(track.items):
+                tracks_to_mute.append(track)
 
-    return [
-        track
-        for track in project.tracks
-        if not track.is_muted and bool(track.items) and not is_vocal(track)
-    ]
+    return tracks_to_mute
 
 
 def find_vox_tracks_to_mute(
@@ -40,11 +42,13 @@ def find_vox_tracks_to_mute(
     Skip tracks that are already muted (wouldn't want to ultimately unmute
     them).
     """
-    return [
-        track
-        for track in project.tracks
-        if not track.is_muted and "(vox)" in track.name.lower()
-    ]
+    with reapy.inside_reaper():
+        vox_tracks = [
+            track
+            for track in project.tracks
+            if not track.is_muted and "(vox)" in track.name.lower()
+        ]
+    return vox_tracks
 
 
 def find_stems(project: reapy.core.Project) -> list[reapy.core.Track]:
@@ -54,8 +58,10 @@ def find_stems(project: reapy.core.Project) -> list[reapy.core.Track]:
     and no FX; they're just for grouping and don't perform any processing on
     the final mix.
     """
-    return [
-        track
-        for track in project.tracks
-        if not track.is_muted and (bool(track.items) or bool(len(track.fxs)))
-    ]
+    with reapy.inside_reaper():
+        stems = [
+            track
+            for track in project.tracks
+            if not track.is_muted and (bool(track.items) or bool(len(track.fxs)))
+        ]
+    return stems
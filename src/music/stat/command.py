@@ -28,7 +28,7 @@ def main(files_or_project_dirs: list[Path], verbose: int) -> None:
         files_or_project_dirs = [Path(music.util.ExtendedProject().path)]
 
     files_nested = [
-        [fil] if fil.is_file() else _files_for_project_dir(fil)
+        [fil] if fil.is_file() else music.util.find_render_fils(fil, SongVersion)
         for fil in files_or_project_dirs
     ]
     files = [fil for nest in files_nested for fil in nest]
@@ -42,11 +42,3 @@ def main(files_or_project_dirs: list[Path], verbose: int) -> None:
             fil, verbose=verbose
         ).items():
             print(f"{k:<16}: {v:<32}")
-
-
-def _files_for_project_dir(project_dir: Path) -> list[Path]:
-    return [
-        fil
-        for version in SongVersion
-        if (fil := version.path_for_project_dir(project_dir)) and fil.is_file()
-    ]
@@ -1,9 +1,7 @@
 """Upload command."""
 
-import email
 from pathlib import Path
 
-import aiohttp
 import click
 import rich.console
 import rich.live
@@ -12,6 +10,7 @@ import music.util
 from music.util import SongVersion
 
 from .process import Process as UploadProcess
+from .process import client_session
 
 
 @click.command("upload")
@@ -103,31 +102,27 @@ async def main(
             param_hint="'SOUNDCLOUD_OAUTH_TOKEN'", param_type="envvar"
         )
 
-    parsed_additional_headers = {**email.message_from_string(additional_headers)}
+    parsed_additional_headers = music.util.parse_headers(additional_headers)
 
     if not project_dirs:
         project_dirs = [Path(music.util.ExtendedProject().path)]
 
-    versions = {
-        version
-        for version in (
-            include_main,
-            include_instrumental,
-            include_instrumental_dj,
-            include_acappella,
+    versions = (
+        SongVersion.union(
+            (
+                include_main,
+                include_instrumental,
+                include_instrumental_dj,
+                include_acappella,
+            )
         )
-        if version
-    } or (
-        SongVersion.MAIN,
-        SongVersion.INSTRUMENTAL,
-        SongVersion.ACAPPELLA,
+        or music.util.DEFAULT_SONG_VERSIONS
     )
 
     files = [
         fil
         for project_dir in project_dirs
-        for version in versions
-        if (fil := version.path_for_project_dir(project_dir)) and fil.is_file()
+        for fil in music.util.find_render_fils(project_dir, versions)
     ]
 
     if not files:
@@ -136,6 +131,11 @@ async def main(
 
     console = rich.console.Console()
     process = UploadProcess(console)
-    with rich.live.Live(process.progress, console=console, refresh_per_second=10):
-        async with aiohttp.ClientSession() as client:
+    with rich.live.Live(
+        process.progress,
+        auto_refresh=console.is_terminal,
+        console=console,
+        refresh_per_second=4,
+    ):
+        async with client_session() as client:
             await process.process(client, oauth_token, parsed_additional_headers, files)
@@ -34,12 +34,26 @@ class _PrepareUploadResponse(TypedDict):
     url: str
 
 
+def client_session() -> aiohttp.ClientSession:
+    """Create an HTTP client for uploads.
+
+    Keeps connections to SoundCloud alive longer than the default, to reuse
+    them between a command's uploads, which may be spaced out by renders.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            keepalive_timeout=75, limit_per_host=4, ttl_dns_cache=300
+        )
+    )
+
+
 class Process:
     """Encapsulate the state of uploading audio files."""
 
     def __init__(self, console: rich.console.Console) -> None:
         """Initialize."""
         self.console = console
+        self._tracks: asyncio.Task[list[dict[str, Any]]] | None = None
 
     async def process(
         self,
@@ -63,18 +77,10 @@ class Process:
             **additional_headers,
         }
 
-        tracks_resp = await client.get(
-            f"https://api-v2.soundcloud.com/users/{USER_ID}/tracks",
-            headers=headers,
-            params={"limit": 999},
-            timeout=aiohttp.ClientTimeout(total=10),
-        )
-        await _raise_for_status(tracks_resp)
-
         files_by_stem = {file.stem: file for file in files}
         tracks_by_title = {
             track["title"]: track
-            for track in (await tracks_resp.json())["collection"]
+            for track in await self._fetch_tracks(client, headers)
             if track["title"] in files_by_stem
         }
         missing_tracks = sorted(set(files_by_stem).difference(tracks_by_title.keys()))
@@ -133,6 +139,38 @@ class Process:
         """Table of successful uploads."""
         return rich.table.Table(box=rich.box.MINIMAL)
 
+    async def _fetch_tracks(
+        self, client: aiohttp.ClientSession, headers: dict[str, str]
+    ) -> list[dict[str, Any]]:
+        """Fetch the user's SoundCloud tracks.
+
+        Fetches once, shared by this instance's concurrent and later calls, for
+        example the uploads of each render in a run. A run uploads each track
+        at most once, so the other tracks' metadata stays current. Retries on
+        the next call if the fetch failed.
+        """
+        if self._tracks is None:
+            self._tracks = asyncio.create_task(self._get_tracks(client, headers))
+
+        try:
+            return await asyncio.shield(self._tracks)
+        except Exception:
+            self._tracks = None
+            raise
+
+    async def _get_tracks(
+        self, client: aiohttp.ClientSession, headers: dict[str, str]
+    ) -> list[dict[str, Any]]:
+        resp = await client.get(
+            f"https://api-v2.soundcloud.com/users/{USER_ID}/tracks",
+            headers=headers,
+            params={"limit": 999},
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+        await _raise_for_status(resp)
+        tracks: list[dict[str, Any]] = (await resp.json())["collection"]
+        return tracks
+
     async def _upload_one_file_to_track(
         self,
         client: aiohttp.ClientSession,
@@ -2,29 +2,29 @@
 
 import asyncio
 import enum
+import importlib
 import json
 import os
 import shutil
-import warnings
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable
 from functools import wraps
 from pathlib import Path
-from typing import Any, NoReturn, TypeVar, cast
+from typing import Any, cast
 
 import aiohttp
-
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", message="Can't reach distant API")
-    import reapy
-
-T = TypeVar("T")
+import reapy
 
 # File: Render project, using the most recent render settings, auto-close render dialog
 RENDER_CMD_ID = 42230
 
 
-class SongVersion(enum.Enum):
-    """Different versions of a song to render."""
+class SongVersion(enum.Flag):
+    """Different versions of a song to render.
+
+    Versions combine into a set of versions, for example `SongVersion.MAIN |
+    SongVersion.INSTRUMENTAL`, which is cheap to build and test membership of.
+    Iterating the combination yields its individual versions.
+    """
 
     MAIN = enum.auto()
     INSTRUMENTAL = enum.auto()
@@ -32,29 +32,26 @@ class SongVersion(enum.Enum):
     ACAPPELLA = enum.auto()
     STEMS = enum.auto()
 
+    @classmethod
+    def union(cls, versions: Iterable["SongVersion | None"]) -> "SongVersion":
+        """Combine the given versions, skipping unset ones."""
+        rv = cls(0)
+        for version in versions:
+            if version:
+                rv |= version
+        return rv
+
     def name_for_project_dir(self, project_dir: Path) -> str:
         """Name of the project for the given song version."""
-        project_name = project_dir.name
-        if self is SongVersion.MAIN:
-            return project_name
-        elif self is SongVersion.INSTRUMENTAL:
-            return f"{project_name} (Instrumental)"
-        elif self is SongVersion.INSTRUMENTAL_DJ:
-            return f"{project_name} (DJ Instrumental)"
-        elif self is SongVersion.ACAPPELLA:
-            return f"{project_name} (A Cappella)"
-        elif self is SongVersion.STEMS:
-            return f"{project_name} (Stems)"
-        else:  # pragma: no cover
-            assert_exhaustiveness(self)
+        return f"{project_dir.name}{_SONG_VERSION_SUFFIXES[self]}"
 
     def path_for_project_dir(self, project_dir: Path) -> Path:
         """Path of the rendered file for the given song version."""
-        path = project_dir / self.name_for_project_dir(project_dir)
+        name = self.name_for_project_dir(project_dir)
         if self is SongVersion.STEMS:
-            return path
+            return project_dir / name
 
-        return Path(f"{path}.wav")
+        return project_dir / f"{name}.wav"
 
     @property
     def pattern(self) -> list[Path]:
@@ -66,6 +63,19 @@ class SongVersion(enum.Enum):
         return []
 
 
+_SONG_VERSION_SUFFIXES = {
+    SongVersion.MAIN: "",
+    SongVersion.INSTRUMENTAL: " (Instrumental)",
+    SongVersion.INSTRUMENTAL_DJ: " (DJ Instrumental)",
+    SongVersion.ACAPPELLA: " (A Cappella)",
+    SongVersion.STEMS: " (Stems)",
+}
+
+DEFAULT_SONG_VERSIONS = (
+    SongVersion.MAIN | SongVersion.INSTRUMENTAL | SongVersion.ACAPPELLA
+)
+
+
 class ExtendedProject(reapy.core.Project):
     """Extend reapy.core.Project with additional properties."""
 
@@ -133,29 +143,47 @@ class ExtendedProject(reapy.core.Project):
         return str(Path(filename).parent)
 
 
-def assert_exhaustiveness(no_return: NoReturn) -> NoReturn:  # pragma: no cover
-    """Provide an assertion at type-check time that this function is never called."""
-    raise AssertionError(f"Invalid value: {no_return!r}")
-
-
 def coro(f: Callable[..., Any]) -> Callable[..., Any]:
     """Decorate Click commands as coroutines.
 
     H/T https://github.com/pallets/click/issues/85
+
+    Runs on uvloop's faster event loop, if it is installed.
     """
 
     @wraps(f)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        return asyncio.run(f(*args, **kwargs))
+        with asyncio.Runner(loop_factory=_uvloop_factory()) as runner:
+            return runner.run(f(*args, **kwargs))
 
     return wrapper
 
 
-def recurse_property(prop: str, obj: T | None) -> Iterator[T]:
-    """Recursively yield the given optional, recursive property, starting with the given object."""
-    while obj is not None:
-        yield obj
-        obj = getattr(obj, prop, None)
+def find_render_fils(project_dir: Path, versions: Iterable[SongVersion]) -> list[Path]:
+    """Find the given versions' existing render files in the given project directory.
+
+    Lists the directory once, instead of checking each version's file
+    separately.
+    """
+    fil_names = {entry.name for entry in os.scandir(project_dir) if entry.is_file()}
+    return [
+        fil
+        for version in versions
+        if (fil := version.path_for_project_dir(project_dir)).name in fil_names
+    ]
+
+
+def parse_headers(text: str | None) -> dict[str, str]:
+    """Parse HTTP headers, one `Name: value` per line, into a dict.
+
+    Skips lines that aren't headers.
+    """
+    headers = {}
+    for line in (text or "").splitlines():
+        name, sep, value = line.partition(":")
+        if sep and name.strip():
+            headers[name.strip()] = value.strip()
+    return headers
 
 
 def rm_rf(path: Path) -> None:
@@ -176,3 +204,11 @@ def set_param_value(param: reapy.core.FXParam, value: float) -> None:
     param.functions["SetParamNormalized"](  # type: ignore[operator]
         parent.id, parent_fx.index, param.index, value
     )
+
+
+def _uvloop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    try:
+        uvloop = importlib.import_module("uvloop")
+    except ImportError:
+        return None
+    return cast(Callable[[], asyncio.AbstractEventLoop], uvloop.new_event_loop)
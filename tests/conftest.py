@@ -52,7 +52,7 @@ def snapshot(
     monkeypatch.setattr("music.render.command._CONSOLE_WIDTH", 999)
 
     tmp_path_str = str(tmp_path)
-    tmp_id_re = re.compile(r"(?P<tmp_id>\s*\d+)(?P<ext>\.tmp)")
+    tmp_id_re = re.compile(r"(?P<tmp_id>\s*[\d-]+)(?P<ext>\.tmp)")
 
     def matcher(data: Any, path: Any) -> Any:
         if isinstance(data, aiohttp.ClientSession):
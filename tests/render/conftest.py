@@ -116,26 +116,30 @@ def render_mocks(
             if key == "RENDER_PATTERN":
                 render_patterns.append(value)
 
+        renders = itertools.count(1)
+
         async def render_fake_file() -> None:
             path = Path(project.path) / f"{render_patterns[-1]}.wav"
             path.parent.mkdir(exist_ok=True, parents=True)
-            path.touch()
+            path.write_text(f"render {next(renders)}")
+
+        def parse_summary_stats(output: str) -> dict[str, float | str]:
+            """Fake different stats for each rendered file, by its render number."""
+            render_number = int(output.removeprefix("render ") or 0)
+            return {"duration": 60.0 + render_number, "size": 1024.0 * render_number}
 
         path = tmp_path / "Stub Song Title (feat. Stub Artist)"
         path.mkdir()
+        project.id = f"(ReaProject*){path}"
         project.path = str(path)
+        project.name = f"{path.name}.rpp"
 
         project.master_track = master_track
         project.tracks = tracks
 
         project.set_info_string.side_effect = collect_render_patterns
         project.render.side_effect = render_fake_file
-        mock_parse_summary_stats.side_effect = itertools.cycle(
-            [
-                {"duration": 1.0, "size": 42.0},
-                {"duration": 250.1, "size": 1024},
-            ]
-        )
+        mock_parse_summary_stats.side_effect = parse_summary_stats
 
         mock_duration_delta.return_value = datetime.timedelta(seconds=10)
 
@@ -200,17 +204,23 @@ def subprocess() -> Iterator[mock.Mock]:
 def subprocess_with_output(
     subprocess: mock.Mock, tmp_path: Path
 ) -> Iterator[mock.Mock]:
-    """Stub subprocess.run and simulate subprocesses writing output files."""
+    """Stub subprocess.run and simulate subprocesses writing output files.
+
+    Simulates ffmpeg by echoing its input file's contents, like a fake render's
+    number, as its output and into its output file, if any.
+    """
 
     def write_out_file(*args: list[str | Path], **kwargs: Any) -> mock.Mock:
         rv = mock.Mock()
         cmd_args = args[0]
 
         if cmd_args[0] == "ffmpeg":
-            rv.stderr = ""
+            in_fil = Path(cmd_args[2])
+            rv.stderr = in_fil.read_text() if in_fil.is_file() else ""
 
-            out_fil = Path(cmd_args[-1])
-            out_fil.touch()
+            if cmd_args[-1] != "-":
+                out_fil = Path(cmd_args[-1])
+                out_fil.write_text(rv.stderr)
 
         return rv
 
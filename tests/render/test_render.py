@@ -1,28 +1,37 @@
 """Render tests."""
 
+import asyncio
+import contextlib
 import datetime
+import io
 import math
+import wave
+from collections.abc import Awaitable, Callable, Iterator
 from pathlib import Path
 from unittest import mock
 
+import pytest
+import rich.console
 from click.testing import CliRunner
 from syrupy.assertion import SnapshotAssertion
 
+import music.render.contextmanagers
 from music.render.command import main as render
-from music.render.result import RenderResult
+from music.render.process import Process, trim_silence
+from music.render.result import RenderResult, summary_stats_for_file
+from music.render.tracks import find_acappella_tracks_to_mute
 from music.util import SongVersion
 
-from .conftest import RenderMocks
+from .conftest import Fx, RenderMocks, Track
 
 
 def test_render_result_render_speedup(
     snapshot: SnapshotAssertion, subprocess: mock.Mock, tmp_path: Path
 ) -> None:
     """Test RenderResult.render_speedup."""
-    subprocess.return_value.stdout = """
-    [FORMAT]
-    duration=23.209501
-    [/FORMAT]
+    subprocess.return_value.stderr = """
+    Input #0, wav, from 'foo.wav':
+      Duration: 00:00:23.21, bitrate: 2116 kb/s
     """
     project = mock.Mock(path="some/path")
     version = mock.Mock()
@@ -40,6 +49,320 @@ def test_render_result_render_speedup(
     assert subprocess.mock_calls == snapshot
 
 
+def test_render_result_duration_delta_dir(
+    snapshot: SnapshotAssertion, subprocess: mock.Mock, tmp_path: Path
+) -> None:
+    """Test RenderResult.duration_delta sums the audio files in a directory."""
+    subprocess.return_value.stdout = """
+    {
+        "programs": [],
+        "streams": [{"duration": "23.209501"}],
+        "format": {"duration": "23.209501"}
+    }
+    """
+    project = mock.Mock(path="some/path")
+    version = mock.Mock()
+
+    some_dir = tmp_path / "foo"
+    for fil in (some_dir / "01 - bar.wav", some_dir / "02 - baz" / "03 - qux.wav"):
+        fil.parent.mkdir(parents=True, exist_ok=True)
+        fil.touch()
+
+    obj = RenderResult(project, version, some_dir, datetime.timedelta(seconds=4.5))
+
+    assert obj.duration_delta == datetime.timedelta(seconds=46)
+    assert len(subprocess.mock_calls) == 2
+
+    del obj.duration_delta
+    assert obj.duration_delta == datetime.timedelta(seconds=46)
+    assert len(subprocess.mock_calls) == 2, "Unchanged files should not be re-probed"
+
+    tmp_fil = some_dir / "01 - bar.tmp.wav"
+    tmp_fil.touch()
+    tmp_fil.replace(some_dir / "01 - bar.wav")
+
+    del obj.duration_delta
+    assert obj.duration_delta == datetime.timedelta(seconds=46)
+    assert len(subprocess.mock_calls) == 3
+
+
+def test_render_result_duration_delta_stream_fallback(
+    subprocess: mock.Mock, tmp_path: Path
+) -> None:
+    """Test RenderResult.duration_delta when the container has no duration."""
+    subprocess.return_value.stdout = """
+    {"programs": [], "streams": [{"duration": "12.5"}], "format": {}}
+    """
+    project = mock.Mock(path="some/path")
+    version = mock.Mock()
+
+    some_dir = tmp_path / "foo"
+    some_dir.mkdir()
+    (some_dir / "01 - bar.wav").touch()
+
+    obj = RenderResult(project, version, some_dir, datetime.timedelta(seconds=4.5))
+
+    assert obj.duration_delta == datetime.timedelta(seconds=12)
+
+
+def test_summary_stats_for_file_cached(subprocess: mock.Mock, tmp_path: Path) -> None:
+    """Test summary_stats_for_file re-analyzes a file only once it is replaced."""
+    subprocess.return_value.stderr = ""
+
+    fil = tmp_path / "foo.wav"
+    fil.touch()
+
+    summary_stats_for_file(fil)
+    summary_stats_for_file(fil)
+    assert len(subprocess.mock_calls) == 1, "Unchanged files should not be re-analyzed"
+
+    tmp_fil = tmp_path / "foo.tmp.wav"
+    tmp_fil.touch()
+    tmp_fil.replace(fil)
+
+    summary_stats_for_file(fil)
+    assert len(subprocess.mock_calls) == 2
+
+
+async def _analyze(
+    self: Process,
+    before_stats: dict[str, float | str],
+    out: RenderResult,
+    **kwargs: object,
+) -> RenderResult:
+    return out
+
+
+@pytest.mark.asyncio
+@mock.patch.object(Process, "_print_stats_for_render", _analyze)
+async def test_render_and_analyze_yields_before_next_render(tmp_path: Path) -> None:
+    """Test each version is yielded once analyzed, while the next version renders."""
+    process = Process(rich.console.Console(file=io.StringIO()))
+    project = mock.Mock(path=str(tmp_path))
+    main_yielded = asyncio.Event()
+    events = []
+
+    def render(version: SongVersion) -> Callable[[], Awaitable[RenderResult]]:
+        async def fake_render() -> RenderResult:
+            if version == SongVersion.INSTRUMENTAL:
+                await asyncio.wait_for(main_yielded.wait(), timeout=1)
+            events.append(f"rendered {version.name}")
+            return mock.Mock(version=version)
+
+        return fake_render
+
+    async for version, _ in process._render_and_analyze(
+        project,
+        [
+            (version, render(version), process._add_task(tmp_path, version))
+            for version in (SongVersion.MAIN, SongVersion.INSTRUMENTAL)
+        ],
+        dry_run=False,
+        verbose=0,
+    ):
+        events.append(f"yielded {version.name}")
+        if version == SongVersion.MAIN:
+            main_yielded.set()
+
+    assert events == [
+        "rendered MAIN",
+        "yielded MAIN",
+        "rendered INSTRUMENTAL",
+        "yielded INSTRUMENTAL",
+    ]
+
+
+@pytest.mark.asyncio
+@mock.patch.object(Process, "_print_stats_for_render", _analyze)
+async def test_render_and_analyze_render_error(tmp_path: Path) -> None:
+    """Test versions rendered before a failed render are still yielded."""
+    process = Process(rich.console.Console(file=io.StringIO()))
+    project = mock.Mock(path=str(tmp_path))
+
+    async def render_main() -> RenderResult:
+        return mock.Mock(version=SongVersion.MAIN)
+
+    async def render_instrumental() -> RenderResult:
+        raise RuntimeError("Render failed")
+
+    yielded = []
+    with pytest.raises(RuntimeError, match="Render failed"):
+        async for version, _ in process._render_and_analyze(
+            project,
+            [
+                (
+                    SongVersion.MAIN,
+                    render_main,
+                    process._add_task(tmp_path, SongVersion.MAIN),
+                ),
+                (
+                    SongVersion.INSTRUMENTAL,
+                    render_instrumental,
+                    process._add_task(tmp_path, SongVersion.INSTRUMENTAL),
+                ),
+            ],
+            dry_run=False,
+            verbose=0,
+        ):
+            yielded.append(version)
+
+    assert yielded == [SongVersion.MAIN]
+
+
+def _param(name: str) -> mock.Mock:
+    rv = mock.Mock()
+    rv.name = name
+    return rv
+
+
+def _project(path: Path, fxs: list[mock.Mock]) -> mock.Mock:
+    # Every project opened into the same Reaper tab has the same ID
+    rv = mock.Mock(id="(ReaProject*)0xdeadbeef", path=str(path))
+    rv.name = f"{path.name}.rpp"
+    rv.master_track.fxs = fxs
+    return rv
+
+
+def test_find_master_limiter_threshold_per_project_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test the master limiter threshold's cached location is per project file, not per Reaper tab."""
+    monkeypatch.setattr(
+        music.render.contextmanagers, "_MASTER_LIMITER_THRESHOLD_INDICES", {}
+    )
+    threshold_a = _param("Threshold")
+    project_a = _project(
+        tmp_path / "a", [Fx("ReaEQ"), Fx("Master Limiter", params=[threshold_a])]
+    )
+    threshold_b = _param("Threshold")
+    project_b = _project(
+        tmp_path / "b",
+        [Fx("Master Limiter", params=[_param("Ceiling"), threshold_b])],
+    )
+
+    find = music.render.contextmanagers._find_master_limiter_threshold
+    assert find(project_a) is threshold_a
+    assert find(project_b) is threshold_b
+    assert find(project_a) is threshold_a
+
+
+def test_find_master_limiter_threshold_fx_changed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test the master limiter threshold is searched again if the project's FX changed."""
+    monkeypatch.setattr(
+        music.render.contextmanagers, "_MASTER_LIMITER_THRESHOLD_INDICES", {}
+    )
+    threshold = _param("Threshold")
+    project = _project(
+        tmp_path / "a", [Fx("ReaEQ"), Fx("Master Limiter", params=[threshold])]
+    )
+
+    find = music.render.contextmanagers._find_master_limiter_threshold
+    assert find(project) is threshold
+
+    project.master_track.fxs = [
+        Fx("ReaXComp", params=[_param("Ratio")]),
+        Fx("Master Limiter", params=[_param("Ceiling"), threshold]),
+    ]
+    assert find(project) is threshold
+
+    project.master_track.fxs = [Fx("Master Limiter", params=[threshold])]
+    assert find(project) is threshold
+
+    project.master_track.fxs = [
+        Fx("ReaComp", params=[_param("Threshold")]),
+        Fx("Master Limiter", params=[threshold]),
+    ]
+    assert find(project) is threshold
+
+
+def test_batch_enter_exit_error() -> None:
+    """Test an error in the batch_enter_exit block is passed to each context manager's exit."""
+    seen = []
+
+    @contextlib.contextmanager
+    def ctx(name: str) -> Iterator[None]:
+        try:
+            yield
+        except RuntimeError as ex:
+            seen.append((name, str(ex)))
+            raise
+
+    with (
+        mock.patch("reapy.inside_reaper"),
+        pytest.raises(RuntimeError, match="Render failed"),
+    ):
+        with music.render.contextmanagers.batch_enter_exit(ctx("a"), ctx("b")):
+            raise RuntimeError("Render failed")
+
+    assert seen == [("b", "Render failed"), ("a", "Render failed")]
+
+
+def test_find_acappella_tracks_to_mute() -> None:
+    """Test find_acappella_tracks_to_mute skips tracks nested under the vocals."""
+    vocals = Track(name="Vocals")
+    lead = Track(name="Lead")
+    lead.parent_track = vocals
+    lead_double = Track(name="Lead Double")
+    lead_double.parent_track = lead
+    drums = Track(name="Drums")
+    kick = Track(name="Kick")
+    kick.parent_track = drums
+    muted = Track(name="Muted")
+    muted.is_muted = True
+    project = mock.Mock(tracks=[vocals, lead, lead_double, drums, kick, muted])
+
+    with mock.patch("reapy.inside_reaper"):
+        assert find_acappella_tracks_to_mute(project) == [drums, kick]
+
+
+@pytest.mark.parametrize("sampwidth", [2, 3, 4])
+def test_trim_silence_wav(
+    subprocess: mock.Mock, tmp_path: Path, sampwidth: int
+) -> None:
+    """Test trim_silence copies the kept frames of a PCM WAV file, without ffmpeg."""
+
+    def frame(amplitude: float) -> bytes:
+        sample = round(amplitude * ((1 << (8 * sampwidth - 1)) - 1))
+        return sample.to_bytes(sampwidth, "little", signed=True) * 2
+
+    frames = [frame(0.01)] * 300 + [frame(-0.5), frame(0.5)] * 50 + [frame(0.0)] * 500
+
+    fil = tmp_path / "foo.wav"
+    with wave.open(str(fil), "wb") as dst:
+        dst.setnchannels(2)
+        dst.setsampwidth(sampwidth)
+        dst.setframerate(100)
+        dst.writeframes(b"".join(frames))
+
+    trim_silence(fil)
+
+    with wave.open(str(fil), "rb") as src:
+        assert src.getparams()[:3] == (2, sampwidth, 100)
+        assert src.readframes(src.getnframes()) == b"".join(frames[200:700])
+
+    assert not subprocess.mock_calls
+    assert list(tmp_path.iterdir()) == [fil]
+
+
+def test_trim_silence_not_wav(subprocess: mock.Mock, tmp_path: Path) -> None:
+    """Test trim_silence falls back to ffmpeg for files it can't parse as PCM WAV."""
+    fil = tmp_path / "foo.wav"
+    fil.touch()
+
+    def ffmpeg(cmd_args: list[str | Path], **kwargs: object) -> mock.Mock:
+        Path(cmd_args[-1]).touch()
+        return mock.Mock()
+
+    subprocess.side_effect = ffmpeg
+
+    trim_silence(fil)
+
+    assert len(subprocess.mock_calls) == 1
+    assert subprocess.mock_calls[0].args[0][:2] == ["ffmpeg", "-i"]
+
+
 @mock.patch("reapy.reascript_api.SNM_GetIntConfigVar", create=True)
 def test_main_reaper_not_configured(
     mock_get_int_config_var: mock.Mock,
@@ -265,3 +588,65 @@ def test_main_mocked_calls(
         result.stderr,
         render_mocks.mock_calls,
     ) == snapshot
+
+
+@pytest.mark.asyncio
+async def test_render_and_analyze_analysis_error(tmp_path: Path) -> None:
+    """Test a failed analysis lets the version already rendering finish, then renders no more."""
+    process = Process(rich.console.Console(file=io.StringIO()))
+    project = mock.Mock(path=str(tmp_path))
+    analysis_failed = asyncio.Event()
+    events = []
+
+    async def analyze(
+        self: Process,
+        before_stats: dict[str, float | str],
+        out: RenderResult,
+        **kwargs: object,
+    ) -> RenderResult:
+        if out.version == SongVersion.MAIN:
+            analysis_failed.set()
+            raise RuntimeError("Analysis failed")
+        return out
+
+    def render(version: SongVersion) -> Callable[[], Awaitable[RenderResult]]:
+        async def fake_render() -> RenderResult:
+            events.append(f"entered {version.name}")
+            try:
+                if version == SongVersion.INSTRUMENTAL:
+                    await asyncio.wait_for(analysis_failed.wait(), timeout=1)
+                    await asyncio.sleep(0)
+                events.append(f"rendered {version.name}")
+                return mock.Mock(version=version)
+            finally:
+                events.append(f"exited {version.name}")
+
+        return fake_render
+
+    with (
+        mock.patch.object(Process, "_print_stats_for_render", analyze),
+        pytest.raises(RuntimeError, match="Analysis failed"),
+    ):
+        async for _ in process._render_and_analyze(
+            project,
+            [
+                (version, render(version), process._add_task(tmp_path, version))
+                for version in (
+                    SongVersion.MAIN,
+                    SongVersion.INSTRUMENTAL,
+                    SongVersion.STEMS,
+                )
+            ],
+            dry_run=False,
+            verbose=0,
+        ):
+            pass
+
+    assert events == [
+        "entered MAIN",
+        "rendered MAIN",
+        "exited MAIN",
+        "entered INSTRUMENTAL",
+        "rendered INSTRUMENTAL",
+        "exited INSTRUMENTAL",
+    ]
@@ -1,6 +1,7 @@
 """Upload tests."""
 
 import datetime
+import io
 import re
 from pathlib import Path
 from typing import Any
@@ -8,10 +9,12 @@ from unittest import mock
 
 import pytest
 import pytest_socket  # type: ignore[import-untyped]
+import rich.console
 from click.testing import CliRunner
 from syrupy.assertion import SnapshotAssertion
 
 from music.upload.command import main as upload
+from music.upload.process import Process, client_session
 
 from .conftest import RequestsMocks
 
@@ -200,3 +203,27 @@ def test_main_success(
         result.stderr,
         requests_mocks.mock_calls,
     ) == snapshot
+
+
+@pytest.mark.asyncio
+async def test_process_fetches_tracks_once(
+    requests_mocks: RequestsMocks, some_paths: list[Path]
+) -> None:
+    """Test the SoundCloud tracks are fetched once, for all of a process's uploads."""
+    requests_mocks.get.return_value = mock.Mock(
+        json=mock.AsyncMock(
+            return_value={
+                "collection": [
+                    {"last_modified": "2999-01-01T00:00:00Z", "title": path.stem}
+                    for path in some_paths
+                ]
+            }
+        )
+    )
+    process = Process(rich.console.Console(file=io.StringIO()))
+
+    async with client_session() as client:
+        for path in some_paths:
+            await process.process(client, "some-token", {}, [path])
+
+    assert requests_mocks.get.call_count == 1
@@ -60,3 +60,45 @@ async def test_project_render(
     """Test invoking Reaper to render a project."""
     await music.util.ExtendedProject().render()
     assert requests_mocks.mock_calls == snapshot
+
+
+def test_find_render_fils(tmp_path: Path) -> None:
+    """Test finding only the existing render files of the given versions."""
+    project_dir = tmp_path / "some project"
+    project_dir.mkdir()
+    for version in (
+        music.util.SongVersion.MAIN,
+        music.util.SongVersion.ACAPPELLA,
+        music.util.SongVersion.INSTRUMENTAL_DJ,
+    ):
+        version.path_for_project_dir(project_dir).touch()
+    music.util.SongVersion.STEMS.path_for_project_dir(project_dir).mkdir()
+
+    assert music.util.find_render_fils(
+        project_dir,
+        (
+            music.util.SongVersion.MAIN,
+            music.util.SongVersion.INSTRUMENTAL,
+            music.util.SongVersion.ACAPPELLA,
+            music.util.SongVersion.STEMS,
+        ),
+    ) == [
+        project_dir / "some project.wav",
+        project_dir / "some project (A Cappella).wav",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (None, {}),
+        ("", {}),
+        (
+            "Cookie: a=1; b=2\nX-Datadome-ClientId: abc:def\n\nnot a header\n",
+            {"Cookie": "a=1; b=2", "X-Datadome-ClientId": "abc:def"},
+        ),
+    ],
+)
+def test_parse_headers(text: str | None, expected: dict[str, str]) -> None:
+    """Test parse_headers."""
+    assert music.util.parse_headers(text) == expected